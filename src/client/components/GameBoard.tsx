@@ -3,6 +3,9 @@ import { ICard, IGameState } from '../../worker/types';
 import { Card } from './Card';
 import { AnimatedStatusText } from './AnimatedStatusText';
 
+// Log state updates in development builds only
+const DEBUG = process.env.NODE_ENV === 'development';
+
 interface GameBoardProps {
     gameState: IGameState;
     playerId: string;
@@ -21,7 +24,7 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
     const isPlayerTurn = gameState.activePlayerId === playerId;
 
     useEffect(() => {
-        console.log(gameState);
+        if (DEBUG) console.log(gameState);
         if (oldState?.phase === 'scoring') {
             // Find the player whose tricks count increased
             const winner = Object.entries(gameState.players).find(([_, player]) => {
@@ -30,7 +33,7 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
             });
             
             if (winner) {
-                console.log("Trick ended");
+                if (DEBUG) console.log("Trick ended");
                 // Keep the last trick's cards visible
                 setTemporaryTrickCards(oldState.currentTrick);
                 setLastTrickWinner(winner[1].name);
@@ -41,7 +44,7 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
             }
         }
         if (oldState && oldState.currentRound < gameState.currentRound) {
-            console.log("Round ended");
+            if (DEBUG) console.log("Round ended");
             // Round changed - calculate score differences
             const changes: Record<string, number> = {};
             Object.entries(gameState.players).forEach(([id, player]) => {
@@ -72,6 +75,10 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
         }
     };
 
+    // Whether the player holds a card of the lead suit
+    const leadSuit = gameState.leadSuit;
+    const hasLeadSuit = !!leadSuit && !!gameState.players[playerId]?.hand.some(c => c.suit === leadSuit);
+
     const isCardPlayable = (card: ICard, index: number) => {
         if (!isPlayerTurn || gameState.phase !== 'playing') return false;
         
@@ -79,11 +86,7 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
         if (gameState.currentTrick.length === 0) return true;
         
         // Must follow suit if possible
-        const leadSuit = gameState.leadSuit;
-        if (leadSuit && card.suit !== 'special') {
-            const hasLeadSuit = gameState.players[playerId]?.hand.some(c => c.suit === leadSuit && c.suit !== 'special');
-            if (hasLeadSuit && card.suit !== leadSuit) return false;
-        }
+        if (hasLeadSuit && card.suit !== 'special' && card.suit !== leadSuit) return false;
         
         return true;
     };
@@ -179,15 +182,18 @@ export function GameBoard({ gameState, playerId, onPlaceBid, onPlayCard }: GameB
                         <div className="flex flex-wrap gap-2">
                             {(() => {
                                 const numCards = gameState.currentRound;
-                                const currentBids = Object.values(gameState.players).reduce((sum, player) => 
-                                    player.id !== playerId && player.bid !== null ? sum + player.bid : sum, 0);
-                                const isLastBidder = Object.values(gameState.players)
-                                    .filter(p => p.id !== playerId)
-                                    .every(p => p.bid !== null);
+                                let currentBids = 0;
+                                let isLastBidder = true;
+                                for (const p of Object.values(gameState.players)) {
+                                    if (p.id === playerId) continue;
+                                    if (p.bid === null) isLastBidder = false;
+                                    else currentBids += p.bid;
+                                }
+                                // Exclude the bid that would make the total bids equal to the round number
+                                const forbiddenBid = isLastBidder ? numCards - currentBids : null;
 
                                 return Array.from({ length: numCards + 1 }, (_, i) => i)
-                                    // Exclude bids that would make the total bids equal to the round number
-                                    .filter(bid => !isLastBidder || (currentBids + bid !== numCards))
+                                    .filter(bid => bid !== forbiddenBid)
                                     .map(bid => (
                                         <button
                                             key={bid}
@@ -4,7 +4,7 @@ export class Bot {
     /**
      * Determines the bid for a bot player based on the current game state
      */
-    static calculateBid(gameState: IGameState, playerId: string): number {
+    static calculateBid(gameState: IGameState, playerId: string, forbiddenBid: number | null): number {
         const player = gameState.players[playerId];
         if (!player) return 0;
 
@@ -17,7 +17,11 @@ export class Bot {
         }
         // Assume slightly less than average winrate for remaining cards
         const remainingCards = player.hand.length - guaranteedWins;
-        return guaranteedWins + Math.floor(remainingCards / Object.keys(gameState.players).length * 0.8);
+        const bid = guaranteedWins + Math.floor(remainingCards / Object.keys(gameState.players).length * 0.8);
+
+        // The last bidder may not make the total bids equal the round number
+        if (bid !== forbiddenBid) return bid;
+        return bid < gameState.currentRound ? bid + 1 : bid - 1;
     }
 
     /**
@@ -44,26 +48,29 @@ export class Bot {
         return strength;
     }
 
+    /**
+     * Returns the strength a card has to beat to win the current trick,
+     * or null if a wizard has already been played
+     */
+    private static getStrengthToBeat(gameState: IGameState): number | null {
+        let maxTrickStrength = -999;
+        for (const c of gameState.currentTrick) {
+            // If there's a wizard in the trick, we can't win
+            if (c.value === 'wizard') return null;
+            maxTrickStrength = Math.max(maxTrickStrength, this.getCardStrength(c, gameState));
+        }
+        return maxTrickStrength;
+    }
+
     /**
      * Checks if a card can win against the current trick
      */
-    private static canWinTrick(card: ICard, gameState: IGameState): boolean {
+    private static canWinTrick(card: ICard, gameState: IGameState, strengthToBeat: number | null): boolean {
         if (card.value === 'wizard') return true;
         if (card.value === 'jester') return false;
+        if (strengthToBeat === null) return false;
 
-        // If there's a wizard in the trick, we can't win
-        if (gameState.currentTrick.some(c => c.value === 'wizard')) {
-            return false;
-        }
-
-        // Get the strength of our card
-        const ourStrength = this.getCardStrength(card, gameState);
-
-        // Find the strongest card in the current trick
-        const trickStrengths = gameState.currentTrick.map(c => this.getCardStrength(c, gameState));
-        const maxTrickStrength = Math.max(...trickStrengths, -999);
-
-        return ourStrength > maxTrickStrength;
+        return this.getCardStrength(card, gameState) > strengthToBeat;
     }
 
     /**
@@ -88,64 +95,76 @@ export class Bot {
         return Math.random() < probability;
     }
 
+    /**
+     * Returns the strongest or weakest of the ranked cards,
+     * keeping the earliest card on ties
+     */
+    private static pickByStrength<T extends { strength: number }>(rankedCards: T[], pick: 'strongest' | 'weakest'): T {
+        let best = rankedCards[0]!;
+        for (const c of rankedCards) {
+            if (pick === 'strongest' ? c.strength > best.strength : c.strength < best.strength) {
+                best = c;
+            }
+        }
+        return best;
+    }
+
     /**
      * Selects which card the bot should play based on the current game state
      * Returns the index of the card in the player's hand
      */
-    static selectCard(gameState: IGameState, playerId: string, isPlayableCard: (card: ICard, hand: ICard[]) => boolean): number {
+    static selectCard(gameState: IGameState, playerId: string, getPlayableCardIndices: (hand: ICard[]) => number[]): number {
         const player = gameState.players[playerId];
         if (!player) return -1;
 
-        // Get valid cards that can be played
-        const validCards = player.hand.filter((card) => isPlayableCard(card, player.hand));
-        if (validCards.length === 0) return -1;
+        // Get indices of valid cards that can be played
+        const validIndices = getPlayableCardIndices(player.hand);
+        if (validIndices.length === 0) return -1;
 
         // Determine if we want to win this trick
         const wantToWin = this.shouldTryToWin(gameState, playerId);
 
-        // Rank cards by strength
-        const rankedCards = validCards.map(card => ({
-            card,
-            strength: this.getCardStrength(card, gameState),
-            canWin: this.canWinTrick(card, gameState)
-        }));
-
-        let selectedCard: ICard = rankedCards[0]!.card;
-        // Sort cards based on our strategy
+        // Strength a card must beat to win the current trick
+        const strengthToBeat = this.getStrengthToBeat(gameState);
+
+        // Rank cards by strength, keeping track of where they are in the hand
+        const rankedCards = validIndices.map(index => {
+            const card = player.hand[index]!;
+            return {
+                index,
+                strength: this.getCardStrength(card, gameState),
+                canWin: this.canWinTrick(card, gameState, strengthToBeat)
+            };
+        });
+
+        let selectedIndex: number;
+        // Pick a card based on our strategy
         if (wantToWin && gameState.currentTrick.length > 0) {
             // If we want to win but can't, play our worst card
-            const winningCards = rankedCards.filter(c => c.canWin);
-            if (winningCards.length === 0) {
-                rankedCards.sort((a, b) => a.strength - b.strength); // Play worst card
-                selectedCard = rankedCards[0]!.card;
+            if (!rankedCards.some(c => c.canWin)) {
+                selectedIndex = this.pickByStrength(rankedCards, 'weakest').index;
             } else {
-                rankedCards.sort((a, b) => b.strength - a.strength); // Play best winning card
-                selectedCard = rankedCards[0]!.card;
+                selectedIndex = this.pickByStrength(rankedCards, 'strongest').index; // Play best winning card
             }
         } else if (wantToWin) {
             // If we're leading and want to win, play our best card
-            rankedCards.sort((a, b) => b.strength - a.strength);
-            selectedCard = rankedCards[0]!.card;
+            selectedIndex = this.pickByStrength(rankedCards, 'strongest').index;
         } else if (gameState.currentTrick.length > 0) {
             // If we don't want to win and we're not leading,
             // play the strongest card that can't win
             const losingCards = rankedCards.filter(c => !c.canWin);
             if (losingCards.length > 0) {
-                losingCards.sort((a, b) => b.strength - a.strength); // Sort losing cards by highest strength
-                selectedCard = losingCards[0]!.card;
+                selectedIndex = this.pickByStrength(losingCards, 'strongest').index;
             } else {
                 // If all cards can win, play the weakest one
-                rankedCards.sort((a, b) => a.strength - b.strength);
-                selectedCard = rankedCards[0]!.card;
+                selectedIndex = this.pickByStrength(rankedCards, 'weakest').index;
             }
         } else {
             // If we don't want to win and we're leading, play our worst card
-            rankedCards.sort((a, b) => a.strength - b.strength);
-            selectedCard = rankedCards[0]!.card;
+            selectedIndex = this.pickByStrength(rankedCards, 'weakest').index;
         }
         
-        // Find the index of this card in the original hand
-        return player.hand.findIndex(c => c.suit === selectedCard.suit && c.value === selectedCard.value);
+        return selectedIndex;
     }
 
     /**
@@ -154,20 +173,22 @@ export class Bot {
     static async handleTurn(gameState: IGameState, playerId: string, actions: {
         placeBid: (bid: number) => Promise<boolean>,
         playCard: (cardIndex: number) => Promise<boolean>,
-        isPlayableCard: (card: ICard, hand: ICard[]) => boolean
+        getPlayableCardIndices: (hand: ICard[]) => number[],
+        getForbiddenBid: () => number | null
     }): Promise<void> {
         // Add delay to make bot moves feel more natural
         await new Promise(resolve => setTimeout(resolve, 500));
 
         if (gameState.phase === 'bidding') {
-            const bid = this.calculateBid(gameState, playerId);
-            if (!(await actions.placeBid(bid))){
-                if (!(await actions.placeBid(bid + 1))){
-                    await actions.placeBid(bid - 1);
-                }
+            const forbiddenBid = actions.getForbiddenBid();
+            const bid = this.calculateBid(gameState, playerId, forbiddenBid);
+            if (!(await actions.placeBid(bid))) {
+                // calculateBid never returns the forbidden bid, but fall back to a
+                // legal bid rather than leave the game waiting on the bot
+                await actions.placeBid(forbiddenBid === 0 ? 1 : 0);
             }
         } else if (gameState.phase === 'playing') {
-            const cardIndex = this.selectCard(gameState, playerId, actions.isPlayableCard);
+            const cardIndex = this.selectCard(gameState, playerId, actions.getPlayableCardIndices);
             if (cardIndex >= 0) {
                 await actions.playCard(cardIndex);
             }
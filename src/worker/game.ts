@@ -1,9 +1,19 @@
 import { ICard, IGameState, IPlayerRoundResult } from './types';
 import { Bot } from './bot';
 
+// Hands are sorted by suit (alphabetically), then by value, with jesters before wizards
+const SUIT_ORDER: Record<ICard['suit'], number> = { clubs: 0, diamonds: 1, hearts: 2, spades: 3, special: 4 };
+
+function cardSortKey(card: ICard): number {
+    const value = card.value === 'jester' ? 0 : card.value === 'wizard' ? 14 : card.value;
+    return SUIT_ORDER[card.suit] * 16 + value;
+}
+
 export class Game {
     private state: IGameState;
     private broadcastState: () => void; // Function to send game state updates to all clients
+    private playerIds: string[]; // Seating order, kept in sync with players
+    private tricksPlayed: number; // Tricks completed in the current round
 
     constructor(broadcastState: () => void) {
         this.state = {
@@ -18,11 +28,13 @@ export class Game {
             leadSuit: null,
             roundHistory: [],
         };
+        this.playerIds = [];
+        this.tricksPlayed = 0;
         this.broadcastState = broadcastState;
     }
 
     public addPlayer(id: string, name: string, isHuman: boolean): boolean {
-        if (Object.keys(this.state.players).length >= 6) return false;
+        if (this.playerIds.length >= 6) return false;
         
         this.state.players[id] = {
             id,
@@ -34,6 +46,7 @@ export class Game {
             bid: null,
             score: 0
         };
+        this.playerIds = Object.keys(this.state.players);
         
         this.broadcastState();
         return true;
@@ -46,6 +59,7 @@ export class Game {
         // If they're currently a player, remove them from players first
         if (id in this.state.players) {
             delete this.state.players[id];
+            this.playerIds = Object.keys(this.state.players);
         }
 
         this.state.spectators[id] = {
@@ -67,16 +81,15 @@ export class Game {
     }
 
     public async startGame(): Promise<boolean> {
-        if (Object.keys(this.state.players).length < 3) return false;
+        if (this.playerIds.length < 3) return false;
         
         this.state.currentRound = 1;
         this.dealCards();
         this.state.phase = 'bidding';
         
         // Set initial active player for bidding
-        const playerIds = Object.keys(this.state.players);
-        this.state.leadingPlayerId = playerIds[0] ?? null;
-        this.state.activePlayerId = playerIds[0] ?? null;
+        this.state.leadingPlayerId = this.playerIds[0] ?? null;
+        this.state.activePlayerId = this.playerIds[0] ?? null;
         
         this.broadcastState();
         await this.handleBotTurn();
@@ -86,34 +99,33 @@ export class Game {
     private dealCards(): void {
         let deck = this.shuffleDeck(this.createDeck());
         
+        this.tricksPlayed = 0;
+
         // Clear existing hands
         for (const player of Object.values(this.state.players)) {
-            player.hand = [];
+            player.hand.length = 0;
             player.tricks = 0;
             player.bid = null;
         }
 
         // Deal cards based on current round
-        const playerIds = Object.keys(this.state.players);
         for (let i = 0; i < this.state.currentRound; i++) {
-            for (const playerId of playerIds) {
+            for (const playerId of this.playerIds) {
                 const card = deck.pop();
                 if (card) {
                     const player = this.state.players[playerId];
                     if (player) {
                         player.hand.push(card);
-                        player.hand.sort((a, b) => {
-                            if (a.suit < b.suit) return -1;
-                            if (a.suit > b.suit) return 1;
-                            if (a.value < b.value) return -1;
-                            if (a.value > b.value) return 1;  
-                            return 0;
-                            });
                     }
                 }
             }
         }
 
+        // Sort each hand once it's fully dealt
+        for (const player of Object.values(this.state.players)) {
+            player.hand.sort((a, b) => cardSortKey(a) - cardSortKey(b));
+        }
+
         // Set trump card if there are cards remaining
         this.state.trumpCard = deck.pop() ?? null;
     }
@@ -157,26 +169,17 @@ export class Game {
             return false;
         }
 
-        // Check if this is the last player to bid
-        const unbidPlayers = Object.values(this.state.players).filter(p => p.bid === null);
-        if (unbidPlayers.length === 1 && unbidPlayers[0]?.id === playerId) {
-            // Calculate total bids from other players
-            const totalBidsFromOthers = Object.values(this.state.players)
-                .filter(p => p.bid !== null)
-                .reduce((sum, p) => sum + (p.bid ?? 0), 0);
-            
-            // If this bid would make total bids equal current round, reject it
-            if (totalBidsFromOthers + bid === this.state.currentRound) {
-                return false;
-            }
+        // If this bid would make total bids equal current round, reject it
+        const forbiddenBid = this.getForbiddenBid(playerId);
+        if (bid === forbiddenBid) {
+            return false;
         }
 
         player.bid = bid;
         this.moveToNextPlayer();
 
-        // Check if all players have bid
-        const allBid = Object.values(this.state.players).every(p => p.bid !== null);
-        if (allBid) {
+        // Only the last bidder has a forbidden bid, so everyone has now bid
+        if (forbiddenBid !== null) {
             this.state.phase = 'playing';
         }
 
@@ -185,6 +188,18 @@ export class Game {
         return true;
     }
 
+    private getForbiddenBid(playerId: string): number | null {
+        // The last bidder may not make the total bids equal the round number;
+        // returns null if other players still have to bid
+        let totalBidsFromOthers = 0;
+        for (const p of Object.values(this.state.players)) {
+            if (p.id === playerId) continue;
+            if (p.bid === null) return null;
+            totalBidsFromOthers += p.bid;
+        }
+        return this.state.currentRound - totalBidsFromOthers;
+    }
+
     public async playCard(playerId: string, cardIndex: number): Promise<boolean> {
         const player = this.state.players[playerId];
         if (!player || 
@@ -212,7 +227,7 @@ export class Game {
             this.state.leadSuit = card.suit;
         }
 
-        if (this.state.currentTrick.length === Object.keys(this.state.players).length) {
+        if (this.state.currentTrick.length === this.playerIds.length) {
             this.state.phase = 'scoring';
             this.broadcastState();
             await new Promise(resolve => setTimeout(resolve, 100));
@@ -236,7 +251,8 @@ export class Game {
             {
                 placeBid: (bid) => this.placeBid(activePlayer.id, bid),
                 playCard: (cardIndex) => this.playCard(activePlayer.id, cardIndex),
-                isPlayableCard: (card, hand) => this.isPlayableCard(card, hand)
+                getPlayableCardIndices: (hand) => this.getPlayableCardIndices(hand),
+                getForbiddenBid: () => this.getForbiddenBid(activePlayer.id)
             }
         );
     }
@@ -251,12 +267,13 @@ export class Game {
         // Winner of the trick leads the next trick
         this.state.leadingPlayerId = winner;
         this.state.activePlayerId = winner;
-        this.state.currentTrick = [];
+        this.state.currentTrick.length = 0;
         this.state.leadSuit = null;
         this.state.phase = 'playing';
 
-        // Check if round is complete
-        if (Object.values(this.state.players).every(p => p.hand.length === 0)) {
+        // Check if round is complete, which is after one trick per card dealt
+        this.tricksPlayed++;
+        if (this.tricksPlayed === this.state.currentRound) {
             this.broadcastState();
             await new Promise(resolve => setTimeout(resolve, 100));
             this.endRound();
@@ -268,33 +285,49 @@ export class Game {
     }
 
     private isPlayableCard(card: ICard, playerHand: ICard[]): boolean {
-        if (this.state.leadSuit && card.suit !== 'special') {
-            const hasLeadSuit = playerHand.some(c => c.suit === this.state.leadSuit);
-            if (hasLeadSuit && card.suit !== this.state.leadSuit) return false; // Must follow suit if possible
-        }
+        // Specials and cards of the lead suit are always playable
+        const leadSuit = this.state.leadSuit;
+        if (!leadSuit || card.suit === 'special' || card.suit === leadSuit) return true;
 
-        return true;
+        return this.canPlayCard(card, this.hasLeadSuit(playerHand));
     }
 
-    private determineTrickWinner(): string {
-        // Check for wizards first
-        const lastWizard = [...this.state.currentTrick].reverse().find(card => card.value === 'wizard');
-        if (lastWizard) {
-            return lastWizard.playedBy!;
-        }
+    private getPlayableCardIndices(playerHand: ICard[]): number[] {
+        const hasLeadSuit = this.hasLeadSuit(playerHand);
 
-        // If all cards are jesters, the first player (leader) wins
-        if (this.state.currentTrick.every(card => card.value === 'jester')) {
-            return this.state.leadingPlayerId!;
-        }
+        const indices: number[] = [];
+        playerHand.forEach((card, index) => {
+            if (this.canPlayCard(card, hasLeadSuit)) {
+                indices.push(index);
+            }
+        });
+        return indices;
+    }
+
+    private hasLeadSuit(playerHand: ICard[]): boolean {
+        const leadSuit = this.state.leadSuit;
+        return !!leadSuit && playerHand.some(c => c.suit === leadSuit);
+    }
+
+    private canPlayCard(card: ICard, hasLeadSuit: boolean): boolean {
+        // Must follow suit if possible; specials can always be played
+        return !hasLeadSuit || card.suit === 'special' || card.suit === this.state.leadSuit;
+    }
+
+    private determineTrickWinner(): string {
+        // Track the last wizard and the best non-special card played
+        let lastWizard: ICard | null = null;
+        let winningCard: ICard | null = null;
 
-        let winningCard = this.state.currentTrick[0]!;
-        
         for (const card of this.state.currentTrick) {
+            if (card.value === 'wizard') {
+                lastWizard = card;
+                continue;
+            }
             if (card.value === 'jester') continue;
-            
+
             // If we haven't set a non-jester winning card yet
-            if (winningCard.value === 'jester') {
+            if (!winningCard) {
                 winningCard = card;
                 continue;
             }
@@ -315,6 +348,16 @@ export class Game {
             }
         }
 
+        // Wizards beat everything
+        if (lastWizard) {
+            return lastWizard.playedBy!;
+        }
+
+        // If all cards are jesters, the first player (leader) wins
+        if (!winningCard) {
+            return this.state.leadingPlayerId!;
+        }
+
         return winningCard.playedBy!;
     }
 
@@ -347,16 +390,15 @@ export class Game {
 
     private prepareNextRound(): void {
         this.state.currentRound++;
-        if (this.state.currentRound > Math.floor(60 / Object.keys(this.state.players).length)) {
+        if (this.state.currentRound > Math.floor(60 / this.playerIds.length)) {
             this.state.phase = 'finished';
         } else {
             this.dealCards();
             this.state.phase = 'bidding';
             
             // Set the leading player for the new round based on round number
-            const playerIds = Object.keys(this.state.players);
-            const startingPlayerIndex = (this.state.currentRound - 1) % playerIds.length;
-            this.state.leadingPlayerId = playerIds[startingPlayerIndex]!;
+            const startingPlayerIndex = (this.state.currentRound - 1) % this.playerIds.length;
+            this.state.leadingPlayerId = this.playerIds[startingPlayerIndex]!;
             this.state.activePlayerId = this.state.leadingPlayerId;
         }
     }
@@ -364,14 +406,14 @@ export class Game {
     private moveToNextPlayer(): void {
         if (!this.state.activePlayerId) return;
 
-        const playerIds = Object.keys(this.state.players);
-        const currentIndex = playerIds.indexOf(this.state.activePlayerId);
-        this.state.activePlayerId = playerIds[(currentIndex + 1) % playerIds.length]!;
+        const currentIndex = this.playerIds.indexOf(this.state.activePlayerId);
+        this.state.activePlayerId = this.playerIds[(currentIndex + 1) % this.playerIds.length]!;
     }
 
     public removePlayer(id: string): boolean {
         if (id in this.state.players) {
             delete this.state.players[id];
+            this.playerIds = Object.keys(this.state.players);
             this.broadcastState();
             return true;
         }
@@ -383,19 +425,32 @@ export class Game {
         return false;
     }
 
-    public getGameState(playerId: string): IGameState {
-        // Return a copy of the state but without the other players' hands and without the deck
+    public getPlayerCount(): number {
+        return this.playerIds.length;
+    }
+
+    public hasPlayer(id: string): boolean {
+        return id in this.state.players;
+    }
+
+    public getPublicPlayers(): IGameState['players'] {
+        // Copies of all players with their hands hidden
+        return Object.fromEntries(
+            Object.entries(this.state.players).map(([id, player]) => [
+                id,
+                { ...player, hand: [] }
+            ])
+        );
+    }
+
+    public getGameState(playerId: string, publicPlayers: IGameState['players']): IGameState {
+        // Return a copy of the state but without the other players' hands and without the deck.
+        // publicPlayers must come from getPublicPlayers() for the current state.
+        const player = this.state.players[playerId];
         return {
             ...this.state,
-            players: Object.fromEntries(
-                Object.entries(this.state.players).map(([id, player]) => [
-                    id,
-                    {
-                        ...player,
-                        hand: id === playerId ? player.hand : [] // Only include hand for the requesting player
-                    }
-                ])
-            )
+            // Only include hand for the requesting player
+            players: player ? { ...publicPlayers, [playerId]: { ...player } } : publicPlayers
         };
     }
 }
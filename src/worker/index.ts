@@ -11,35 +11,31 @@ interface Session {
     webSocket: WebSocket;
 }
 
-export class GameManager {
-    private rooms: Map<string, GameRoom>;
+// Durable Object hosting a single game; the entry point routes each gameId to its own instance
+export class GameLobby {
+    private room: GameRoom | null;
 
     constructor() {
-        this.rooms = new Map();
+        this.room = null;
     }
 
     async fetch(request: Request) {
         const url = new URL(request.url);
-        const gameId = url.searchParams.get('gameId');
-
-        if (!gameId) {
-            return new Response('Game ID required', { status: 400 });
-        }
-
-        // Get or create game room
-        let gameRoom = this.rooms.get(gameId);
-        if (!gameRoom) {
-            gameRoom = new GameRoom();
-            this.rooms.set(gameId, gameRoom);
-        }
 
         if (url.pathname === '/websocket') {
             if (request.headers.get('Upgrade') !== 'websocket') {
                 return new Response('Expected websocket', { status: 400 });
             }
 
-            const [client, server] = Object.values(new WebSocketPair());
-            await gameRoom.handleSession(server!);
+            // Get or create game room
+            if (!this.room) {
+                this.room = new GameRoom(() => { this.room = null; });
+            }
+
+            const pair = new WebSocketPair();
+            const client = pair[0];
+            const server = pair[1];
+            await this.room.handleSession(server);
 
             return new Response(null, {
                 status: 101,
@@ -57,8 +53,10 @@ class GameRoom {
     private gameStarted: boolean;
     private lastActivityTime: number;
     private cleanupInterval: ReturnType<typeof setInterval>;
+    private onCleanup: () => void;
 
-    constructor() {
+    constructor(onCleanup: () => void) {
+        this.onCleanup = onCleanup;
         this.game = new Game(() => this.broadcastGameState());
         this.sessions = [];
         this.gameStarted = false;
@@ -115,6 +113,8 @@ class GameRoom {
         }
         this.sessions = [];
         clearInterval(this.cleanupInterval);
+        // Drop the room so the next connection starts a fresh one
+        this.onCleanup();
     }
 
     private async handleMessage(session: Session, message: ClientMessage) {
@@ -140,9 +140,7 @@ class GameRoom {
                         isSpectator: false
                     });
                 } else {
-                    const gameState = this.game.getGameState(session.id);
-                    const playerCount = Object.keys(gameState.players).length;
-                    const error = playerCount >= 6 
+                    const error = this.game.getPlayerCount() >= 6 
                         ? 'Game is full (maximum 6 players)' 
                         : 'A player with that name already exists';
                     this.sendError(session, error);
@@ -222,8 +220,19 @@ class GameRoom {
     }
 
     private sendMessage(session: Session, message: ServerMessage) {
-        this.lastActivityTime = Date.now();
-        session.webSocket.send(JSON.stringify(message));
+        this.recordActivity();
+        this.sendRaw(session, JSON.stringify(message));
+    }
+
+    private sendRaw(session: Session, data: string) {
+        session.webSocket.send(data);
+    }
+
+    private recordActivity() {
+        // Messages only count as activity when someone is connected to receive them
+        if (this.sessions.length > 0) {
+            this.lastActivityTime = Date.now();
+        }
     }
 
     private sendError(session: Session, message: string) {
@@ -234,23 +243,42 @@ class GameRoom {
     }
 
     private broadcast(message: ServerMessage) {
-        this.sessions.forEach(session => this.sendMessage(session, message));
+        this.recordActivity();
+        const data = JSON.stringify(message);
+        this.sessions.forEach(session => this.sendRaw(session, data));
     }
 
     private broadcastGameState() {
+        // Spectators and unjoined sessions all receive the same public state
+        let publicMessage: string | null = null;
+        const publicPlayers = this.game.getPublicPlayers();
+        this.recordActivity();
         this.sessions.forEach(session => {
-            const state = this.game.getGameState(session.id);
-            this.sendMessage(session, {
+            if (this.game.hasPlayer(session.id)) {
+                const state = this.game.getGameState(session.id, publicPlayers);
+                this.sendRaw(session, JSON.stringify({
+                    type: 'game_state',
+                    state
+                } as ServerMessage));
+                return;
+            }
+            publicMessage ??= JSON.stringify({
                 type: 'game_state',
-                state
+                state: this.game.getGameState(session.id, publicPlayers)
             } as ServerMessage);
+            this.sendRaw(session, publicMessage);
         });
     }
 }
 
 export default {
     fetch: async (request: Request, env: Env) => {
-        const gameManager = env.GAME.get(env.GAME.idFromName('singleton'));
-        return gameManager.fetch(request);
+        const gameId = new URL(request.url).searchParams.get('gameId');
+        if (!gameId) {
+            return new Response('Game ID required', { status: 400 });
+        }
+
+        const gameLobby = env.GAME.get(env.GAME.idFromName(gameId));
+        return gameLobby.fetch(request);
     }
 } as ExportedHandler;